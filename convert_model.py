@@ -1,9 +1,47 @@
+import os
 import joblib
 
 # Load your existing model
 rf_model = joblib.load("models/rf_model.joblib")
 
+# Zero per-node training statistics that prediction never reads. sklearn
+# validates the node layout on load, so thresholds and values have to
+# stay float64; zeroed columns compress down to almost nothing instead.
+for est in rf_model.estimators_:
+    state = est.tree_.__getstate__()
+    nodes = state["nodes"].copy()
+    for field in ("impurity", "n_node_samples", "weighted_n_node_samples"):
+        nodes[field] = 0
+    state["nodes"] = nodes
+    est.tree_.__setstate__(state)
+
+try:
+    import lz4  # noqa: F401
+    compress = ("lz4", 3)
+except ImportError:
+    compress = ("zlib", 3)
+
 # Re-save using protocol=4 (compatible with most Python versions)
-joblib.dump(rf_model, "models/rf_model_compat.joblib", protocol=4)
+joblib.dump(rf_model, "models/rf_model_compat.joblib", compress=compress, protocol=4)
 
 print("✅ Model re-saved successfully as rf_model_compat.joblib")
+
+# Optionally compile the forest to a native predictor for the dashboard
+try:
+    import treelite
+    import tl2cgen
+except ImportError:
+    # A build from a previous model would otherwise be served as-is
+    if os.path.exists("models/rf_predictor.so"):
+        os.remove("models/rf_predictor.so")
+        print("🗑️ Removed stale rf_predictor.so")
+    print("ℹ️ treelite/tl2cgen not installed, skipping compiled predictor")
+else:
+    tl_model = treelite.sklearn.import_model(rf_model)
+    tl2cgen.export_lib(
+        tl_model,
+        toolchain="gcc",
+        libpath="models/rf_predictor.so",
+        params={"parallel_comp": 4},
+    )
+    print("✅ Compiled predictor saved as rf_predictor.so")
@@ -1,10 +1,9 @@
 # dashboard.py
 import streamlit as st
 import pandas as pd
-import joblib
-from fpdf import FPDF   # Works with fpdf2
+import numpy as np
 from io import BytesIO
-import time
+from dashboard_core import load_model, analyze_upload, summarize_grades, export_csv, export_pdf
 
 # -----------------------------
 # PAGE CONFIG
@@ -44,17 +43,7 @@ st.write("")
 # -----------------------------
 # SAFE MODEL LOADING
 # -----------------------------
-@st.cache_resource
-def load_model():
-    try:
-        model = joblib.load("models/rf_model_compat.joblib")
-        features = joblib.load("models/training_features.joblib")
-        return model, features
-    except Exception as e:
-        st.error("❌ Model files missing or corrupted.")
-        st.stop()
-
-rf_model, training_features = load_model()
+load_model()
 
 # -----------------------------
 # FILE UPLOADER
@@ -63,68 +52,32 @@ uploaded_file = st.file_uploader("📂 Upload Student CSV File", type="csv")
 
 if uploaded_file:
 
-    # Loading animation
-    with st.spinner("🧠 AI analyzing academic patterns..."):
-        progress = st.progress(0)
-        for i in range(100):
-            time.sleep(0.01)
-            progress.progress(i + 1)
-
-    st.success("AI analysis complete!")
-
     # -----------------------------
     # READ DATA
     # -----------------------------
+    raw = uploaded_file.getvalue()
     try:
-        data = pd.read_csv(uploaded_file, sep=';')
+        preview = pd.read_csv(BytesIO(raw), sep=';', nrows=5)
     except Exception:
         st.error("❌ Error reading CSV file.")
         st.stop()
 
     st.subheader("📄 Uploaded Data Preview")
-    st.dataframe(data.head())
+    st.dataframe(preview)
 
-    # Remove G3 if exists
-    if "G3" in data.columns:
-        data = data.drop("G3", axis=1)
+    max_rows = st.number_input("🔢 Max students to analyze", min_value=1, value=1_000_000, step=1000)
 
-    # Encode categorical variables
-    categorical_cols = data.select_dtypes(include=['object']).columns
-    data = pd.get_dummies(data, columns=categorical_cols, drop_first=True)
-
-    # Ensure all training columns exist
-    missing_cols = set(training_features) - set(data.columns)
-    for col in missing_cols:
-        data[col] = 0
+    with st.spinner("🧠 AI analyzing academic patterns..."):
+        try:
+            data = analyze_upload(raw, max_rows)
+        except Exception:
+            st.error("❌ Error reading CSV file.")
+            st.stop()
 
-    data = data[training_features]
+    st.success("AI analysis complete!")
 
-    # -----------------------------
-    # AI PREDICTIONS
-    # -----------------------------
-    predictions = rf_model.predict(data)
-    data["Predicted Grade"] = predictions.round(1)
-
-    def risk_label(x):
-        if x < 10:
-            return "At Risk"
-        elif x < 14:
-            return "Average"
-        else:
-            return "Excellent"
-
-    data["Risk Level"] = data["Predicted Grade"].apply(risk_label)
-
-    def explain(row):
-        g = row["Predicted Grade"]
-        if g < 10:
-            return f"High failure risk. Score {g}/20. Needs urgent academic support."
-        elif g < 14:
-            return f"Average performance ({g}/20). Can improve with guidance."
-        else:
-            return f"Excellent performance ({g}/20). Likely top performer."
-
-    data["AI Comment"] = data.apply(explain, axis=1)
+    if len(data) == max_rows:
+        st.info(f"ℹ️ Only the first {max_rows:,} students were analyzed. Raise the limit above to include more.")
 
     # -----------------------------
     # EXECUTIVE DASHBOARD
@@ -132,10 +85,7 @@ if uploaded_file:
     st.divider()
     st.subheader("📊 Executive AI Dashboard")
 
-    avg_grade = data["Predicted Grade"].mean()
-    total_students = len(data)
-    risk_count = (data["Risk Level"] == "At Risk").sum()
-    excellent_count = (data["Risk Level"] == "Excellent").sum()
+    avg_grade, total_students, risk_count, excellent_count = summarize_grades(data)
 
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("👨‍🎓 Students", total_students)
@@ -147,7 +97,10 @@ if uploaded_file:
 
     # Top students
     st.subheader("🏆 Top Performing Students")
-    top_students = data.sort_values(by="Predicted Grade", ascending=False).head(5)
+    grades = data["Predicted Grade"].to_numpy()
+    top_idx = np.argpartition(-grades, 5)[:5] if grades.size > 5 else np.arange(grades.size)
+    top_idx = top_idx[np.argsort(-grades[top_idx], kind="stable")]
+    top_students = data.iloc[top_idx]
     st.dataframe(top_students[["Predicted Grade", "Risk Level"]])
 
     # At risk
@@ -177,7 +130,7 @@ if uploaded_file:
     # -----------------------------
     # DOWNLOAD CSV
     # -----------------------------
-    csv = data.to_csv(index=False).encode('utf-8')
+    csv = export_csv(data)
 
     st.download_button(
         label="⬇️ Download Updated CSV with Predictions",
@@ -192,35 +145,11 @@ if uploaded_file:
     if st.button("📄 Generate Full AI Report"):
 
         try:
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", "B", 18)
-            pdf.cell(0, 12, "AI Academic Intelligence Report", ln=True, align="C")
-            pdf.ln(8)
-
-            pdf.set_font("Arial", "", 12)
-            pdf.cell(0, 8, f"Total Students: {total_students}", ln=True)
-            pdf.cell(0, 8, f"Class Average: {avg_grade:.2f}/20", ln=True)
-            pdf.cell(0, 8, f"At Risk Students: {risk_count}", ln=True)
-            pdf.cell(0, 8, f"Excellent Students: {excellent_count}", ln=True)
-            pdf.ln(8)
-
-            for i, row in data.iterrows():
-                pdf.multi_cell(
-                    0, 7,
-                    f"Student {i+1}\n"
-                    f"Predicted Grade: {row['Predicted Grade']}/20\n"
-                    f"Risk Level: {row['Risk Level']}\n"
-                    f"{row['AI Comment']}"
-                )
-                pdf.ln(2)
-
-            pdf_bytes = pdf.output(dest="S").encode("latin-1", "ignore")
-            pdf_buffer = BytesIO(pdf_bytes)
+            pdf_bytes = export_pdf(data, avg_grade, risk_count, excellent_count)
 
             st.download_button(
                 label="⬇️ Download AI PDF Report",
-                data=pdf_buffer,
+                data=pdf_bytes,
                 file_name="AI_student_report.pdf",
                 mime="application/pdf"
             )
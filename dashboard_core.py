@@ -0,0 +1,270 @@
+# dashboard_core.py
+import streamlit as st
+import pandas as pd
+import numpy as np
+import joblib
+from io import BytesIO
+import gc
+import os
+import tempfile
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+# -----------------------------
+# SAFE MODEL LOADING
+# -----------------------------
+@st.cache_resource
+def load_model():
+    try:
+        model = joblib.load("models/rf_model_compat.joblib")
+        # Spread tree prediction across all cores
+        model.n_jobs = -1
+        # Features are encoded in training order and passed as an ndarray,
+        # so drop the stored names instead of warning on every predict
+        if hasattr(model, "feature_names_in_"):
+            del model.feature_names_in_
+        features = joblib.load("models/training_features.joblib")
+        feature_index = {name: i for i, name in enumerate(features)}
+    except Exception as e:
+        st.error("❌ Model files missing or corrupted.")
+        st.stop()
+
+    # Saved by save_categorical_cols.py; older model folders fall back to dtype detection
+    try:
+        categorical_cols = frozenset(joblib.load("models/categorical_cols.joblib"))
+    except FileNotFoundError:
+        categorical_cols = None
+
+    return model, features, feature_index, categorical_cols
+
+COMPILED_PREDICTOR_PATH = "models/rf_predictor.so"
+
+@st.cache_resource
+def load_compiled_predictor():
+    # Optional Treelite build from convert_model.py; joblib model otherwise
+    if not os.path.exists(COMPILED_PREDICTOR_PATH):
+        return None
+    try:
+        import tl2cgen
+    except ImportError:
+        return None
+
+    try:
+        predictor = tl2cgen.Predictor(COMPILED_PREDICTOR_PATH)
+        # A build left over from an older model must not serve predictions,
+        # so it has to agree with the joblib forest on a fixed probe batch
+        rf_model, features, _, _ = load_model()
+        probe = np.random.default_rng(0).uniform(0, 20, size=(32, len(features))).astype(np.float32)
+        compiled = predictor.predict(tl2cgen.DMatrix(probe)).ravel()
+        if not np.allclose(compiled, rf_model.predict(probe), atol=1e-3):
+            st.warning("⚠️ Compiled predictor does not match the model, using the joblib model.")
+            return None
+        return predictor
+    except Exception:
+        st.warning("⚠️ Compiled predictor failed to load, using the joblib model.")
+        return None
+
+def predict_grades(X):
+    compiled_predictor = load_compiled_predictor()
+    if compiled_predictor is not None:
+        import tl2cgen
+        return compiled_predictor.predict(tl2cgen.DMatrix(X)).ravel()
+    rf_model, _, _, _ = load_model()
+    return rf_model.predict(np.ascontiguousarray(X, dtype=np.float32))
+
+# -----------------------------
+# FEATURE ENCODING
+# -----------------------------
+def encode_features(data, categorical_cols):
+    """One-hot encode straight into the training feature layout.
+
+    Categories are written into their training columns with a single
+    scatter per column; the drop_first baseline has no training column
+    and is skipped, as are values the model never saw.
+    """
+    _, training_features, feature_index, _ = load_model()
+    n = len(data)
+    X = np.zeros((n, len(training_features)), dtype=np.float32)
+    rows = np.arange(n)
+
+    for col in data.columns:
+        if col in categorical_cols:
+            codes, uniques = pd.factorize(data[col].to_numpy())
+            # Trailing -1 maps missing values (code -1) to "no column"
+            target_idx = np.array(
+                [feature_index.get(f"{col}_{value}", -1) for value in uniques] + [-1]
+            )
+            targets = target_idx[codes]
+            hit = targets >= 0
+            X[rows[hit], targets[hit]] = 1
+        elif col in feature_index:
+            X[:, feature_index[col]] = data[col].to_numpy(dtype=np.float32)
+
+    return X
+
+# -----------------------------
+# CSV PARSING
+# -----------------------------
+def read_csv_full(raw, sep=';'):
+    try:
+        return pd.read_csv(BytesIO(raw), sep=sep, engine="pyarrow")
+    except Exception:
+        # pyarrow missing or stricter than the C parser on this file
+        return pd.read_csv(BytesIO(raw), sep=sep, engine="c", low_memory=False)
+
+CHUNK_SIZE = 100_000
+STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+def read_csv_chunks(raw, sep=';'):
+    with pd.read_csv(BytesIO(raw), sep=sep, chunksize=CHUNK_SIZE, engine="c", low_memory=False) as reader:
+        yield from reader
+
+# -----------------------------
+# AI PIPELINE
+# -----------------------------
+def predict_frame(data):
+    """Predict grades, risk levels and comments for one raw student frame."""
+    _, training_features, _, categorical_cols = load_model()
+
+    # Remove G3 if exists
+    if "G3" in data.columns:
+        data = data.drop("G3", axis=1)
+
+    # Encode categorical variables
+    if categorical_cols is None:
+        categorical_cols = set(data.select_dtypes(include=['object', 'string']).columns)
+    X = encode_features(data, categorical_cols)
+
+    # AI predictions
+    predictions = predict_grades(X)
+
+    # X stays internal to prediction; users see numeric columns with their
+    # parsed dtypes and one-hot columns as bool, like get_dummies output
+    data = pd.DataFrame(
+        {
+            name: data[name] if name in data.columns else X[:, i].astype(bool)
+            for i, name in enumerate(training_features)
+        },
+        index=data.index,
+    )
+    data["Predicted Grade"] = predictions.round(1)
+
+    grades = data["Predicted Grade"].to_numpy()
+    grade_str = grades.astype(str)
+    conditions = [grades < 10, grades < 14]
+
+    data["Risk Level"] = pd.Categorical(
+        np.select(conditions, ["At Risk", "Average"], default="Excellent"),
+        categories=["At Risk", "Average", "Excellent"],
+        ordered=True,
+    )
+
+    data["AI Comment"] = np.select(
+        conditions,
+        [
+            np.char.add(np.char.add("High failure risk. Score ", grade_str), "/20. Needs urgent academic support."),
+            np.char.add(np.char.add("Average performance (", grade_str), "/20). Can improve with guidance."),
+        ],
+        default=np.char.add(np.char.add("Excellent performance (", grade_str), "/20). Likely top performer."),
+    )
+
+    return data
+
+# Bounded so past uploads do not stay resident for the life of the process
+@st.cache_data(show_spinner=False, max_entries=8)
+def analyze_upload(raw, max_rows):
+    """Run the AI pipeline over an upload.
+
+    Small uploads are parsed and predicted in one shot. Uploads above
+    STREAM_THRESHOLD_BYTES go chunk by chunk: each analyzed chunk is
+    appended to a Parquet file on disk and freed before the next one is
+    parsed, so the parsed and encoded intermediates are bounded by one
+    chunk. The raw upload bytes, the result read back from Parquet and
+    its cached copy still scale with the file. Parsing stops once
+    max_rows students are analyzed. Results are cached on the upload
+    bytes, so widget reruns skip the whole pipeline.
+    """
+    if len(raw) <= STREAM_THRESHOLD_BYTES:
+        return predict_frame(read_csv_full(raw).iloc[:max_rows])
+
+    rows = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "predictions.parquet")
+        writer = None
+        try:
+            for chunk in read_csv_chunks(raw):
+                chunk = predict_frame(chunk.iloc[:max_rows - rows])
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                elif table.schema != writer.schema:
+                    # e.g. an int column parsed as float in a chunk with blanks
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+                del chunk, table
+                gc.collect()
+                if rows >= max_rows:
+                    break
+        finally:
+            if writer is not None:
+                writer.close()
+        return pd.read_parquet(path)
+
+def summarize_grades(data):
+    """Class average, size, at-risk and excellent counts in one pass per column."""
+    grades = data["Predicted Grade"].to_numpy()
+    # Risk Level codes follow its categories: At Risk, Average, Excellent
+    level_counts = np.bincount(data["Risk Level"].cat.codes.to_numpy(), minlength=3)
+    return grades.mean(), grades.size, int(level_counts[0]), int(level_counts[2])
+
+# -----------------------------
+# EXPORTS
+# -----------------------------
+def export_csv(data):
+    csv_buffer = BytesIO()
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(data, preserve_index=False), csv_buffer)
+        return csv_buffer.getvalue()
+    except pa.ArrowException:
+        return data.to_csv(index=False).encode('utf-8')
+
+def export_pdf(data, avg_grade, risk_count, excellent_count):
+    # Imported here so cold starts skip fpdf until a report is requested
+    from fpdf import FPDF   # Works with fpdf2
+
+    total_students = len(data)
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 18)
+    pdf.cell(0, 12, "AI Academic Intelligence Report", ln=True, align="C")
+    pdf.ln(8)
+
+    pdf.set_font("Arial", "", 12)
+    pdf.cell(0, 8, f"Total Students: {total_students}", ln=True)
+    pdf.cell(0, 8, f"Class Average: {avg_grade:.2f}/20", ln=True)
+    pdf.cell(0, 8, f"At Risk Students: {risk_count}", ln=True)
+    pdf.cell(0, 8, f"Excellent Students: {excellent_count}", ln=True)
+    pdf.ln(8)
+
+    grades = data["Predicted Grade"].to_numpy()
+    risks = data["Risk Level"].to_numpy()
+    comments = data["AI Comment"].to_numpy()
+
+    for i, (grade, risk, comment) in enumerate(zip(grades, risks, comments)):
+        pdf.multi_cell(
+            0, 7,
+            f"Student {i+1}\n"
+            f"Predicted Grade: {grade}/20\n"
+            f"Risk Level: {risk}\n"
+            f"{comment}"
+        )
+        pdf.ln(2)
+
+    # fpdf2 already returns bytes; only PyFPDF 1.7 hands back a latin-1 str
+    output = pdf.output(dest="S")
+    if isinstance(output, str):
+        return output.encode("latin-1", "ignore")
+    return bytes(output)
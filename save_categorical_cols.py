@@ -0,0 +1,13 @@
+import joblib
+
+# Save the categorical schema the model was trained on so the dashboard
+# can skip dtype detection on every upload. One-hot training features
+# are named "<column>_<value>", so the schema is read off the feature
+# list itself and cannot drift from the model.
+training_features = joblib.load("models/training_features.joblib")
+categorical_cols = list(dict.fromkeys(
+    name.split("_", 1)[0] for name in training_features if "_" in name
+))
+joblib.dump(categorical_cols, "models/categorical_cols.joblib", protocol=4)
+
+print("✅ Categorical columns saved as categorical_cols.joblib")